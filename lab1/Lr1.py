@@ -147,39 +147,44 @@ def evaluate(password, person):
         "example_stronger_password": example
     }
 
-# --- Демонстраційні паролі для тестування---
-tests = [
-    ("Інсекьюрний (включає ім'я і дату)", "Валерія2004"),
-    ("Інсекьюрний латиницею + дата", "valeria06122004"),
-    ("Покращений приклад", "V@l3r!a#06Dec9xT")
-]
+def main():
+    # --- Демонстраційні паролі для тестування---
+    tests = [
+        ("Інсекьюрний (включає ім'я і дату)", "Валерія2004"),
+        ("Інсекьюрний латиницею + дата", "valeria06122004"),
+        ("Покращений приклад", "V@l3r!a#06Dec9xT")
+    ]
 
-# Виконати аналіз для кожного тестового пароля
-results = []
-for label, pwd in tests:
-    res = evaluate(pwd, person)
-    res["label"] = label
-    results.append(res)
+    # Виконати аналіз для кожного тестового пароля
+    results = []
+    for label, pwd in tests:
+        res = evaluate(pwd, person)
+        res["label"] = label
+        results.append(res)
 
-# Вивід у читабельному форматі
-for r in results:
+    # Вивід у читабельному форматі
+    for r in results:
+        print("—" * 80)
+        print(f"Тест: {r['label']}")
+        print(f"Пароль: {r['password']}")
+        print(f"Довжина: {r['length']} (оцінка довжини: {r['length_score']}/10)")
+        print(f"Різноманітність символів: типів = {r['variety_types']}, оцінка = {r['variety_score']}/10")
+        if r['personal_matches']:
+            print("=> ПРИМІТНО: знайдені фрагменти персональних даних у паролі:", r['personal_matches'])
+        if r['dictionary_matches']:
+            print("=> ПРИМІТНО: словникові/очевидні підрядки:", r['dictionary_matches'])
+        if r['details']:
+            for d in r['details']:
+                print(" -", d)
+        print(f"Штрафні бали (віднято зі шкали): {r['penalty']}")
+        print(f"Сирий скор (0–100 після штрафів): {r['raw_score_0_100']}")
+        print(f"Кінцева оцінка безпеки (1–10): {r['final_score_1_10']}")
+        print("Рекомендації для покращення:")
+        for rec in r['recommendations']:
+            print(" *", rec)
+        print("Приклад сильнішого пароля для натхнення (не копіюйте буквально):", r['example_stronger_password'])
     print("—" * 80)
-    print(f"Тест: {r['label']}")
-    print(f"Пароль: {r['password']}")
-    print(f"Довжина: {r['length']} (оцінка довжини: {r['length_score']}/10)")
-    print(f"Різноманітність символів: типів = {r['variety_types']}, оцінка = {r['variety_score']}/10")
-    if r['personal_matches']:
-        print("=> ПРИМІТНО: знайдені фрагменти персональних даних у паролі:", r['personal_matches'])
-    if r['dictionary_matches']:
-        print("=> ПРИМІТНО: словникові/очевидні підрядки:", r['dictionary_matches'])
-    if r['details']:
-        for d in r['details']:
-            print(" -", d)
-    print(f"Штрафні бали (віднято зі шкали): {r['penalty']}")
-    print(f"Сирий скор (0–100 після штрафів): {r['raw_score_0_100']}")
-    print(f"Кінцева оцінка безпеки (1–10): {r['final_score_1_10']}")
-    print("Рекомендації для покращення:")
-    for rec in r['recommendations']:
-        print(" *", rec)
-    print("Приклад сильнішого пароля для натхнення (не копіюйте буквально):", r['example_stronger_password'])
-print("—" * 80)
+
+
+if __name__ == "__main__":
+    main()
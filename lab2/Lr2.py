@@ -1,6 +1,5 @@
 import re
 import unicodedata
-import pandas as pd
 
 
 # --- Налаштування персональних даних (використані у генерації ключів) ---
@@ -137,78 +136,84 @@ def key_complexity_vigenere(key):
     complexity = (len(k) * uniq) / (len(ALPHABET) * len(k))  # simplified -> uniq/len(alphabet)
     return uniq / len(ALPHABET)
 
-# --- Генерація ключів ---
-caesar_shift = caesar_key_from_birthdate(person["birthdate"])
-vigenere_key = vigenere_key_from_surname(person["last_name"])
-
-# --- Шифрування ---
-caesar_cipher = caesar_encrypt(plaintext, caesar_shift)
-vigenere_cipher = vigenere_encrypt(plaintext, vigenere_key)
-
-# --- Дешифрування (перевірка) ---
-caesar_decrypted = caesar_decrypt(caesar_cipher, caesar_shift)
-vigenere_decrypted = vigenere_decrypt(vigenere_cipher, vigenere_key)
-
-# --- Обчислення метрик ---
-metrics = []
-for method, cipher, key_desc in [
-    ("Caesar", caesar_cipher, f"shift={caesar_shift}"),
-    ("Vigenere", vigenere_cipher, f"key='{vigenere_key}'")
-]:
-    metrics.append({
-        "method": method,
-        "key": key_desc,
-        "plaintext_length": len(plaintext),
-        "ciphertext_length": len(cipher),
-        "readability_ratio": round(readability_metric(cipher), 3),
-        "key_complexity": round(key_complexity_caesar(caesar_shift) if method=="Caesar" else key_complexity_vigenere(vigenere_key), 3)
-    })
-
-# --- Підсумкові результати ---
-print("Персональні дані (використані для генерації ключів):")
-print("  Прізвище:", person["last_name"])
-print("  Ім'я:", person["first_name"])
-print("  Дата народження:", person["birthdate"])
-print()
-print("Вхідний текст:")
-print(" ", plaintext)
-print()
-print("Згенеровані ключі:")
-print("  Caesar shift (сума цифр дати % len(alphabet)) ->", caesar_shift)
-print("  Vigenere key (з прізвища) ->", vigenere_key)
-print()
-print("Результати шифрування:")
-print("  Caesar ciphertext:")
-print("   ", caesar_cipher)
-print("  Vigenere ciphertext:")
-print("   ", vigenere_cipher)
-print()
-print("Перевірка дешифрування:")
-print("  Caesar decrypted == plaintext ?", caesar_decrypted == normalize_text(plaintext))
-print("  Vigenere decrypted == plaintext ?", vigenere_decrypted == normalize_text(plaintext))
-print()
-
-# Підготовка таблиці порівняння
-df = pd.DataFrame(metrics)
-df["readability_percent"] = (df["readability_ratio"] * 100).astype(str) + "%"
-df_display = df[["method","key","plaintext_length","ciphertext_length","readability_percent","key_complexity"]]
-
-print(df_display)
-
-# Висновки (короткі)
-conclusions = []
-conclusions.append("1) Довжина шифртексту для обох методів дорівнює довжині початкового повідомлення (символ-на-символ шифрування для букв).")
-conclusions.append("2) Readability_ratio показує, наскільки багато кириличних літер залишаються впізнаваними у шифртексті; для Цезаря значення може бути відносно високим при малих зміщеннях, для Віженера зміни часто виглядають більш 'розбитими'.")
-conclusions.append("3) Складність ключа: для Цезаря ключ — одне число, низька ентропія; для Віженера ключ — рядок, складність зростає з довжиною і унікальністю символів.")
-conclusions.append("4) У контексті сучасної криптографії обидва методи є ненадійними для захисту реальних даних; їхня цінність — навчальна та історична.")
-print("Короткі висновки:")
-for c in conclusions:
-    print(" ", c)
-
-# Додаткові поради:
-print()
-print("Рекомендації для демонстраційного використання та тестів:")
-print(" - Показувати різні варіанти ключів (короткі/довгі, з низькою/високою унікальністю символів).")
-print(" - Додати аналіз криптостійкості (наприклад, частотний аналіз для Цезаря та к-р на ключ довжину для Віженера).")
-print()
-print("--- Кінець демонстрації ---")
+def main():
+    # --- Генерація ключів ---
+    caesar_shift = caesar_key_from_birthdate(person["birthdate"])
+    vigenere_key = vigenere_key_from_surname(person["last_name"])
+
+    # --- Шифрування ---
+    caesar_cipher = caesar_encrypt(plaintext, caesar_shift)
+    vigenere_cipher = vigenere_encrypt(plaintext, vigenere_key)
+
+    # --- Дешифрування (перевірка) ---
+    caesar_decrypted = caesar_decrypt(caesar_cipher, caesar_shift)
+    vigenere_decrypted = vigenere_decrypt(vigenere_cipher, vigenere_key)
+
+    # --- Обчислення метрик ---
+    metrics = []
+    for method, cipher, key_desc in [
+        ("Caesar", caesar_cipher, f"shift={caesar_shift}"),
+        ("Vigenere", vigenere_cipher, f"key='{vigenere_key}'")
+    ]:
+        metrics.append({
+            "method": method,
+            "key": key_desc,
+            "plaintext_length": len(plaintext),
+            "ciphertext_length": len(cipher),
+            "readability_ratio": round(readability_metric(cipher), 3),
+            "key_complexity": round(key_complexity_caesar(caesar_shift) if method=="Caesar" else key_complexity_vigenere(vigenere_key), 3)
+        })
+
+    # --- Підсумкові результати ---
+    print("Персональні дані (використані для генерації ключів):")
+    print("  Прізвище:", person["last_name"])
+    print("  Ім'я:", person["first_name"])
+    print("  Дата народження:", person["birthdate"])
+    print()
+    print("Вхідний текст:")
+    print(" ", plaintext)
+    print()
+    print("Згенеровані ключі:")
+    print("  Caesar shift (сума цифр дати % len(alphabet)) ->", caesar_shift)
+    print("  Vigenere key (з прізвища) ->", vigenere_key)
+    print()
+    print("Результати шифрування:")
+    print("  Caesar ciphertext:")
+    print("   ", caesar_cipher)
+    print("  Vigenere ciphertext:")
+    print("   ", vigenere_cipher)
+    print()
+    print("Перевірка дешифрування:")
+    print("  Caesar decrypted == plaintext ?", caesar_decrypted == normalize_text(plaintext))
+    print("  Vigenere decrypted == plaintext ?", vigenere_decrypted == normalize_text(plaintext))
+    print()
+
+    # Підготовка таблиці порівняння (pandas потрібен лише тут)
+    import pandas as pd
+    df = pd.DataFrame(metrics)
+    df["readability_percent"] = (df["readability_ratio"] * 100).astype(str) + "%"
+    df_display = df[["method","key","plaintext_length","ciphertext_length","readability_percent","key_complexity"]]
+
+    print(df_display)
+
+    # Висновки (короткі)
+    conclusions = []
+    conclusions.append("1) Довжина шифртексту для обох методів дорівнює довжині початкового повідомлення (символ-на-символ шифрування для букв).")
+    conclusions.append("2) Readability_ratio показує, наскільки багато кириличних літер залишаються впізнаваними у шифртексті; для Цезаря значення може бути відносно високим при малих зміщеннях, для Віженера зміни часто виглядають більш 'розбитими'.")
+    conclusions.append("3) Складність ключа: для Цезаря ключ — одне число, низька ентропія; для Віженера ключ — рядок, складність зростає з довжиною і унікальністю символів.")
+    conclusions.append("4) У контексті сучасної криптографії обидва методи є ненадійними для захисту реальних даних; їхня цінність — навчальна та історична.")
+    print("Короткі висновки:")
+    for c in conclusions:
+        print(" ", c)
+
+    # Додаткові поради:
+    print()
+    print("Рекомендації для демонстраційного використання та тестів:")
+    print(" - Показувати різні варіанти ключів (короткі/довгі, з низькою/високою унікальністю символів).")
+    print(" - Додати аналіз криптостійкості (наприклад, частотний аналіз для Цезаря та к-р на ключ довжину для Віженера).")
+    print()
+    print("--- Кінець демонстрації ---")
+
+
+if __name__ == "__main__":
+    main()
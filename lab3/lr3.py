@@ -1,7 +1,7 @@
-from PIL import Image
-import numpy as np
 import math, os, unicodedata, re
 
+# PIL та NumPy імпортуються всередині функцій, що працюють із зображеннями
+
 def text_to_bits(s: str) -> str:
     data = s.encode('utf-8')
     return ''.join(f'{byte:08b}' for byte in data)
@@ -11,6 +11,8 @@ def bits_to_text(b: str) -> str:
     return bytes(bytes_list).decode('utf-8', errors='replace')
 
 def hide_message(input_image_path: str, output_image_path: str, message: str, bits_per_channel: int = 1):
+    from PIL import Image
+    import numpy as np
     if bits_per_channel < 1 or bits_per_channel > 2:
         raise ValueError("bits_per_channel must be 1 or 2 for this demo.")
     img = Image.open(input_image_path).convert('RGB')
@@ -48,6 +50,8 @@ def hide_message(input_image_path: str, output_image_path: str, message: str, bi
     }
 
 def extract_message(stego_image_path: str, bits_per_channel: int = 1) -> str:
+    from PIL import Image
+    import numpy as np
     img = Image.open(stego_image_path).convert('RGB')
     arr = np.array(img)
     flat = arr.flatten()
@@ -73,6 +77,8 @@ def extract_message(stego_image_path: str, bits_per_channel: int = 1) -> str:
 #     Image.fromarray(arr).save(path, format='PNG')
 
 def mse(img1_path, img2_path):
+    from PIL import Image
+    import numpy as np
     a = np.array(Image.open(img1_path).convert('RGB'), dtype=np.float64)
     b = np.array(Image.open(img2_path).convert('RGB'), dtype=np.float64)
     if a.shape != b.shape:
@@ -86,58 +92,65 @@ def psnr(img1_path, img2_path):
     max_pixel = 255.0
     return 20 * math.log10(max_pixel / math.sqrt(m))
 
-orig_path = "anotherCat.jpg"
-stego_path = "stego_image.png"
-report_path = "stego_report.txt"
-
-# generate_test_image(orig_path, size=(512,512))
-
-secret_message = "Змєул Валерія 06.12.2004"
-
-info = hide_message(orig_path, stego_path, secret_message, bits_per_channel=1)
-
-extracted = extract_message(stego_path, bits_per_channel=1)
-
-orig_size = os.path.getsize(orig_path)
-stego_size = os.path.getsize(stego_path)
-mse_val = mse(orig_path, stego_path)
-psnr_val = psnr(orig_path, stego_path)
-
-orig_arr = np.array(Image.open(orig_path).convert('RGB'))
-stego_arr = np.array(Image.open(stego_path).convert('RGB'))
-diff_pixels = np.sum(np.any(orig_arr != stego_arr, axis=2))
-total_pixels = orig_arr.shape[0] * orig_arr.shape[1]
-
-with open(report_path, "w", encoding="utf-8") as f:
-    f.write("Steganography LSB demonstration report\n")
-    f.write(f"Message: {secret_message}\n")
-    f.write(f"Message bits: {info['message_bits']}\n")
-    f.write(f"Total payload bits: {info['total_payload_bits']}\n")
-    f.write(f"Capacity bits: {info['capacity_bits']}\n")
-    f.write(f"Estimated pixels needed: {info['pixels_changed_estimate']}\n")
-    f.write(f"Extraction successful: {extracted == secret_message}\n")
-    f.write(f"File sizes: original={orig_size}, stego={stego_size}\n")
-    f.write(f"MSE={mse_val}, PSNR={psnr_val}\n")
-    f.write(f"Pixels changed: {diff_pixels} of {total_pixels}\n")
-
-print("=== Steganography LSB demonstration ===")
-print("Original image:", orig_path)
-print("Stego image:   ", stego_path)
-print()
-print("Message to hide:", secret_message)
-print("Message bits:", info["message_bits"])
-print("Total payload bits (with 32-bit header):", info["total_payload_bits"])
-print("Capacity bits:", info["capacity_bits"])
-print("Estimated pixels needed:", info["pixels_changed_estimate"])
-print()
-print("Extraction result:", extracted)
-print("Extraction successful:", extracted == secret_message)
-print()
-print("File sizes: original =", orig_size, "bytes; stego =", stego_size, "bytes")
-print("MSE =", round(mse_val,6), "; PSNR =", round(psnr_val,6), "dB")
-print(f"Pixels changed: {diff_pixels} of {total_pixels} ({diff_pixels/total_pixels*100:.6f} % )")
-print()
-print("Files:")
-print(f" - Original: [Download original image](sandbox:{orig_path})")
-print(f" - Stego:    [Download stego image](sandbox:{stego_path})")
-print(f" - Report:   [Download report](sandbox:{report_path})")
+def main():
+    from PIL import Image
+    import numpy as np
+    orig_path = "anotherCat.jpg"
+    stego_path = "stego_image.png"
+    report_path = "stego_report.txt"
+
+    # generate_test_image(orig_path, size=(512,512))
+
+    secret_message = "Змєул Валерія 06.12.2004"
+
+    info = hide_message(orig_path, stego_path, secret_message, bits_per_channel=1)
+
+    extracted = extract_message(stego_path, bits_per_channel=1)
+
+    orig_size = os.path.getsize(orig_path)
+    stego_size = os.path.getsize(stego_path)
+    mse_val = mse(orig_path, stego_path)
+    psnr_val = psnr(orig_path, stego_path)
+
+    orig_arr = np.array(Image.open(orig_path).convert('RGB'))
+    stego_arr = np.array(Image.open(stego_path).convert('RGB'))
+    diff_pixels = np.sum(np.any(orig_arr != stego_arr, axis=2))
+    total_pixels = orig_arr.shape[0] * orig_arr.shape[1]
+
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("Steganography LSB demonstration report\n")
+        f.write(f"Message: {secret_message}\n")
+        f.write(f"Message bits: {info['message_bits']}\n")
+        f.write(f"Total payload bits: {info['total_payload_bits']}\n")
+        f.write(f"Capacity bits: {info['capacity_bits']}\n")
+        f.write(f"Estimated pixels needed: {info['pixels_changed_estimate']}\n")
+        f.write(f"Extraction successful: {extracted == secret_message}\n")
+        f.write(f"File sizes: original={orig_size}, stego={stego_size}\n")
+        f.write(f"MSE={mse_val}, PSNR={psnr_val}\n")
+        f.write(f"Pixels changed: {diff_pixels} of {total_pixels}\n")
+
+    print("=== Steganography LSB demonstration ===")
+    print("Original image:", orig_path)
+    print("Stego image:   ", stego_path)
+    print()
+    print("Message to hide:", secret_message)
+    print("Message bits:", info["message_bits"])
+    print("Total payload bits (with 32-bit header):", info["total_payload_bits"])
+    print("Capacity bits:", info["capacity_bits"])
+    print("Estimated pixels needed:", info["pixels_changed_estimate"])
+    print()
+    print("Extraction result:", extracted)
+    print("Extraction successful:", extracted == secret_message)
+    print()
+    print("File sizes: original =", orig_size, "bytes; stego =", stego_size, "bytes")
+    print("MSE =", round(mse_val,6), "; PSNR =", round(psnr_val,6), "dB")
+    print(f"Pixels changed: {diff_pixels} of {total_pixels} ({diff_pixels/total_pixels*100:.6f} % )")
+    print()
+    print("Files:")
+    print(f" - Original: [Download original image](sandbox:{orig_path})")
+    print(f" - Stego:    [Download stego image](sandbox:{stego_path})")
+    print(f" - Report:   [Download report](sandbox:{report_path})")
+
+
+if __name__ == "__main__":
+    main()
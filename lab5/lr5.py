@@ -18,12 +18,17 @@ def decrypt_message(ciphertext_b64: str, personal_data: str) -> str:
     decrypted = xor_crypt(encrypted, key)
     return decrypted.decode("utf-8")
 
-email = "valeriia.zmieul@hneu.net"
-personal_basis = "".join(ch for ch in email if ch.isalnum()) + "2004"
+def main():
+    email = "valeriia.zmieul@hneu.net"
+    personal_basis = "".join(ch for ch in email if ch.isalnum()) + "2004"
 
-message = "Зустрічаємося завтра о 15:00"
+    message = "Зустрічаємося завтра о 15:00"
 
-ciphertext = encrypt_message(message, personal_basis)
-recovered = decrypt_message(ciphertext, personal_basis)
+    ciphertext = encrypt_message(message, personal_basis)
+    recovered = decrypt_message(ciphertext, personal_basis)
 
-print(ciphertext, "\n", recovered)
\ No newline at end of file
+    print(ciphertext, "\n", recovered)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import parse_qsl
+
+from . import metrics
+from .sqli_guard import check_params, blocked_body
+
+from .lr6 import (
+    DB_PATH, FETCH_BATCH_SIZE, NDJSON_MIMETYPE, SQLI_GUARD_MODE, GUARDED_PATHS, INSTRUMENTED_PATHS,
+    init_db, first_values, parse_search_args, resolve_db_path, row_to_dict, iter_rows,
+    build_safe_query, build_vulnerable_query, safe_search_db, vulnerable_search_db,
+)
+
+# ASGI-варіант ендпоінтів /safe_search та /vulnerable_search.
+# Блокуючі запити до SQLite виконуються в обмеженому пулі потоків,
+# щоб не зупиняти цикл подій.
+#
+#   python labs.py asgi --workers 4 --port 5001
+#
+# Метрики кількох воркерів сумуються через знімки в LAB6_METRICS_DIR (див. metrics.py),
+# тому /metrics будь-якого воркера показує дані всього сервісу.
+
+# Розмір пулу потоків для SQLite (на один процес-воркер)
+DB_THREADS = int(os.environ.get("LAB6_DB_THREADS", "8"))
+# Скільки пакетів NDJSON може чекати на відправку клієнту
+STREAM_QUEUE_SIZE = 4
+# Як часто продюсер, заблокований на повній черзі, перевіряє сигнал зупинки (с)
+STOP_POLL_S = 0.1
+
+_executor = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix="lab6-db")
+
+ROUTES = {
+    "/safe_search": (safe_search_db, build_safe_query),
+    "/vulnerable_search": (vulnerable_search_db, build_vulnerable_query),
+}
+
+
+def _in_request_context(func, *args, **kwargs):
+    # Виконується в потоці пулу з копією контексту запиту: фази й рядки
+    # записуються у той самий стан metrics, а потік — у профілювальник
+    state = metrics.current_state()
+    samples = state["samples"] if state is not None else None
+    if samples is not None:
+        metrics.PROFILER.attach(samples)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if samples is not None:
+            metrics.PROFILER.detach()
+
+
+async def run_db(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _executor, lambda: ctx.run(_in_request_context, func, *args, **kwargs))
+
+
+async def send_json(send, body, status=200):
+    with metrics.phase("serialize"):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+def _produce_ndjson(query, params, db_path, loop, queue, stop):
+    # Виконується в пулі потоків: з'єднання SQLite живе лише в цьому потоці,
+    # черга обмежена, тому повільний клієнт гальмує читання курсора.
+    # stop встановлюється, коли клієнт відключився або обробник завершився —
+    # тоді продюсер кидає роботу й звільняє потік пулу
+    def put(item):
+        try:
+            fut = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:  # цикл подій уже закрито
+            return False
+        while True:
+            try:
+                fut.result(timeout=STOP_POLL_S)
+                return True
+            except FutureTimeoutError:
+                if stop.is_set():
+                    fut.cancel()
+                    return False
+
+    chunk = []
+    count = 0
+    db_error = False
+    rows = iter_rows(query, params, db_path)
+    try:
+        for r in rows:
+            count += 1
+            chunk.append(json.dumps(row_to_dict(r), ensure_ascii=False) + "\n")
+            if len(chunk) >= FETCH_BATCH_SIZE:
+                if stop.is_set() or not put("".join(chunk).encode("utf-8")):
+                    return
+                chunk = []
+    except Exception as e:
+        db_error = True
+        chunk.append(json.dumps({"query": query, "error": str(e)}, ensure_ascii=False) + "\n")
+    finally:
+        rows.close()
+        metrics.add_rows(count, db_error=db_error)
+    if chunk and not put("".join(chunk).encode("utf-8")):
+        return
+    put(None)
+
+
+async def _watch_disconnect(receive, stop):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            stop.set()
+            return
+
+
+async def send_ndjson(send, receive, query, params, db_path=DB_PATH):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    stop = threading.Event()
+    ctx = contextvars.copy_context()
+    producer = loop.run_in_executor(
+        _executor,
+        lambda: ctx.run(_in_request_context, _produce_ndjson, query, params, db_path, loop, queue, stop))
+    # після відключення клієнта send у uvicorn нічого не робить, тож стежимо за receive()
+    watcher = asyncio.ensure_future(_watch_disconnect(receive, stop))
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", NDJSON_MIMETYPE.encode())],
+        })
+        while not stop.is_set():
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait({getter, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                return
+            chunk = getter.result()
+            if chunk is None:
+                break
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            return
+        await send({"type": "http.response.body", "body": b""})
+        await producer
+    finally:
+        # при відключенні, винятку чи скасуванні продюсер побачить stop
+        # щонайпізніше за STOP_POLL_S і звільнить потік пулу
+        stop.set()
+        watcher.cancel()
+        producer.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+
+def create_app(db_path=None):
+    # ASGI-застосунок для вибраної бази (--db, LAB6_DB або lab6/students.db).
+    # Воркери uvicorn викликають його як фабрику: "lab6.asgi_app:create_app", factory=True
+    db_path = resolve_db_path(db_path)
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    _executor.shutdown(wait=False)
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["path"] == "/metrics":
+            payload = metrics.render_prometheus().encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", metrics.PROMETHEUS_CONTENT_TYPE.encode())],
+            })
+            await send({"type": "http.response.body", "body": payload})
+            return
+
+        if scope["path"] not in INSTRUMENTED_PATHS:
+            await handle_search(scope, receive, send, db_path)
+            return
+
+        # Статус відповіді перехоплюється з першого повідомлення http.response.start
+        status = [500]
+
+        async def send_tracked(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        state, token = metrics.start_request(attach_thread=False)
+        try:
+            await handle_search(scope, receive, send_tracked, db_path)
+        finally:
+            metrics.finish_request(state, token, scope["path"], status[0])
+
+    return app
+
+
+def _accept_header(scope):
+    # Кілька заголовків Accept рівнозначні одному, розділеному комами
+    values = [value.decode("latin-1") for name, value in scope.get("headers", []) if name == b"accept"]
+    return ",".join(values) or None
+
+
+async def handle_search(scope, receive, send, db_path=DB_PATH):
+    route = ROUTES.get(scope["path"])
+    if route is None:
+        await send_json(send, {"error": "not found"}, status=404)
+        return
+    if scope["method"] != "GET":
+        await send_json(send, {"error": "method not allowed"}, status=405)
+        return
+
+    search_db, build_query = route
+    pairs = parse_qsl(scope.get("query_string", b"").decode("utf-8"), keep_blank_values=True)
+    if SQLI_GUARD_MODE != "off" and scope["path"] in GUARDED_PATHS:
+        found = check_params(pairs, scope["path"])
+        if found is not None and SQLI_GUARD_MODE == "block":
+            await send_json(send, blocked_body(found), status=400)
+            return
+    try:
+        q, ndjson, after_id, limit = parse_search_args(first_values(pairs), _accept_header(scope))
+    except ValueError as e:
+        await send_json(send, {"error": str(e)}, status=400)
+        return
+
+    if ndjson:
+        query, params = build_query(q, after_id, limit)
+        await send_ndjson(send, receive, query, params, db_path)
+        return
+
+    result = await run_db(search_db, q, db_path=db_path, after_id=after_id, limit=limit)
+    with metrics.phase("convert"):
+        rows = [row_to_dict(r) for r in result.get("rows", [])]
+    body = {"query": result.get("query"), "rows": rows,
+            "next_after_id": result.get("next_after_id")}
+    if "error" in result:
+        body["error"] = result["error"]
+    await send_json(send, body)
+
+
+# Для "uvicorn lab6.asgi_app:app": база з LAB6_DB на момент імпорту
+app = create_app()
+
+APP_FACTORY = "lab6.asgi_app:create_app"
+
+
+def _bind_nodelay_socket(host, port):
+    # Сокет для кількох воркерів відкриваємо самі з proto=IPPROTO_TCP: сокет від uvicorn
+    # має proto=0, і asyncio тоді не вмикає TCP_NODELAY для з'єднань, а відповіді
+    # чекають ~40 мс (алгоритм Нейгла + відкладений ACK клієнта)
+    import socket
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_workers(config):
+    # Запуск config.workers процесів на власному сокеті з TCP_NODELAY.
+    # Використовує uvicorn.supervisors.Multiprocess(config, sockets=[...]) — внутрішній
+    # API uvicorn (підпис змінювався між версіями). Якщо він недоступний або
+    # має інший підпис, повертаємося до публічного uvicorn.run(..., workers=N):
+    # сервіс працює, але без виправлення TCP_NODELAY
+    import uvicorn
+
+    sock = _bind_nodelay_socket(config.host, config.port)
+    try:
+        from uvicorn.supervisors import Multiprocess
+        supervisor = Multiprocess(config, sockets=[sock])
+    except (ImportError, TypeError) as e:
+        sock.close()
+        print(f"uvicorn.supervisors.Multiprocess недоступний ({e}); "
+              "запуск через uvicorn.run без TCP_NODELAY", file=sys.stderr)
+        uvicorn.run(APP_FACTORY, factory=True, host=config.host, port=config.port, workers=config.workers,
+                    log_level="warning", access_log=False)
+        return
+    supervisor.run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Запуск lab6 як ASGI-сервісу (uvicorn)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--db", help="файл бази SQLite (за замовчуванням LAB6_DB або lab6/students.db)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    db_path = os.path.abspath(resolve_db_path(args.db))
+    init_db(db_path, force=False)
+    # воркери (окремі процеси) отримують шлях до бази через середовище
+    os.environ["LAB6_DB"] = db_path
+    # корінь репозиторію, щоб воркери могли імпортувати пакет lab6
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    config = uvicorn.Config(APP_FACTORY, factory=True, host=args.host, port=args.port, workers=args.workers,
+                            log_level="warning", access_log=False)
+    if args.workers <= 1:
+        uvicorn.Server(config).run()
+        return 0
+
+    # Кожен воркер — окремий процес зі своїм пулом потоків для SQLite і своїми
+    # лічильниками; через спільний каталог знімків /metrics віддає суму по всіх воркерах
+    metrics_dir = os.environ.get("LAB6_METRICS_DIR")
+    own_dir = not metrics_dir
+    if own_dir:
+        metrics_dir = tempfile.mkdtemp(prefix="lab6-metrics-")
+    metrics.reset_snapshot_dir(metrics_dir)
+    os.environ["LAB6_METRICS_DIR"] = metrics_dir
+    try:
+        run_workers(config)
+    finally:
+        if own_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
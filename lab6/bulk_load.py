@@ -0,0 +1,225 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+
+from .lr6 import DB_PATH, SCHEMA_SQL, INSERT_SQL, resolve_db_path
+
+# Завантаження великих обсягів студентів у students.db
+# та детермінований генератор синтетичних даних для навантажувальних тестів.
+#
+#   python labs.py bulk-load generate --rows 1000000 --seed 42 -o students.csv
+#   python labs.py bulk-load load students.csv
+#   python labs.py bulk-load load --synthetic 1000000 --seed 42
+
+FIELDS = ("first_name", "last_name", "email", "group_name")
+
+DEFAULT_BATCH_SIZE = 50_000
+# Як часто друкувати проміжну швидкість (рядків)
+DEFAULT_PROGRESS_EVERY = 1_000_000
+
+# Послаблені pragma на час завантаження. Усі вони діють лише в межах цього
+# з'єднання, тож після його закриття база працює з налаштуваннями за замовчуванням.
+# journal_mode = MEMORY (а не OFF): без журналу ROLLBACK не визначений
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode = MEMORY;",
+    "PRAGMA synchronous = OFF;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA cache_size = -262144;",  # ~256 MiB
+    "PRAGMA locking_mode = EXCLUSIVE;",
+)
+
+# --- Дані для генератора ---
+MALE_FIRST_NAMES = [
+    "Іван", "Марко", "Андрій", "Олександр", "Дмитро", "Максим", "Богдан", "Тарас",
+    "Остап", "Назар", "Юрій", "Василь", "Петро", "Михайло", "Роман", "Сергій",
+    "Олег", "Ярослав", "Денис", "Артем", "Віктор", "Степан", "Матвій", "Данило",
+]
+FEMALE_FIRST_NAMES = [
+    "Валерія", "Олена", "Марія", "Анна", "Софія", "Ірина", "Наталія", "Оксана",
+    "Юлія", "Катерина", "Дарина", "Вікторія", "Христина", "Тетяна", "Соломія", "Ольга",
+    "Анастасія", "Людмила", "Зоряна", "Мирослава", "Діана", "Поліна", "Єва", "Яна",
+]
+# Прізвища, однакові для обох статей
+COMMON_LAST_NAMES = [
+    "Петренко", "Коваленко", "Бондаренко", "Ткаченко", "Шевченко", "Кравченко",
+    "Олійник", "Коваль", "Мельник", "Шевчук", "Поліщук", "Бойко", "Ткачук",
+    "Савченко", "Руденко", "Марченко", "Лисенко", "Гончаренко", "Мороз", "Кравчук",
+    "Змєул", "Федоренко", "Павленко", "Собко", "Гнатюк", "Карпенко", "Левченко",
+]
+# Прізвища на -ський/-цький та -ов/-ін мають жіночу форму
+GENDERED_LAST_NAMES = [
+    ("Ковальський", "Ковальська"), ("Яворський", "Яворська"), ("Вишневський", "Вишневська"),
+    ("Грицький", "Грицька"), ("Іванов", "Іванова"), ("Соколов", "Соколова"),
+    ("Кузьмін", "Кузьміна"), ("Литвинов", "Литвинова"),
+]
+GROUP_PREFIXES = ["CS", "SE", "CY", "IT", "IS", "AI"]
+GROUPS_PER_PREFIX = 12
+EMAIL_DOMAINS = ["hneu.net", "example.com", "student.hneu.edu.ua", "ukr.net", "gmail.com"]
+
+# Транслітерація для email (спрощена офіційна схема)
+TRANSLIT = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e', 'є': 'ie', 'ж': 'zh',
+    'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
+    'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'iu', 'я': 'ia', "'": '',
+}
+
+
+def transliterate(s):
+    return "".join(TRANSLIT.get(ch, ch) for ch in s.lower())
+
+
+def generate_students(count, seed=42):
+    # Детермінований генератор: однаковий seed -> однакова послідовність рядків
+    rnd = random.Random(seed)
+    groups = [f"{p}-{n}" for p in GROUP_PREFIXES for n in range(1, GROUPS_PER_PREFIX + 1)]
+    for i in range(count):
+        female = rnd.random() < 0.5
+        first = rnd.choice(FEMALE_FIRST_NAMES if female else MALE_FIRST_NAMES)
+        if rnd.random() < 0.8:
+            last = rnd.choice(COMMON_LAST_NAMES)
+        else:
+            last = rnd.choice(GENDERED_LAST_NAMES)[1 if female else 0]
+        # номер рядка в email гарантує унікальність адрес
+        email = f"{transliterate(first)}.{transliterate(last)}{i}@{rnd.choice(EMAIL_DOMAINS)}"
+        yield (first, last, email, rnd.choice(groups))
+
+
+def write_students(rows, out, fmt):
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+    else:
+        for r in rows:
+            out.write(json.dumps(dict(zip(FIELDS, r)), ensure_ascii=False) + "\n")
+
+
+def detect_format(path):
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def read_students(path, fmt=None):
+    # Потокове читання: у пам'яті лише поточний рядок файлу
+    fmt = fmt or detect_format(path)
+    # utf-8-sig: CSV з Excel починається з BOM, який інакше потрапляє в назву першої колонки
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            missing = [k for k in FIELDS if k not in (reader.fieldnames or ())]
+            if missing:
+                raise ValueError(f"{path}: у заголовку CSV немає колонок {', '.join(missing)}")
+            for rec in reader:
+                yield tuple(rec.get(k) for k in FIELDS)
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    rec = json.loads(line)
+                    yield tuple(rec.get(k) for k in FIELDS)
+
+
+def bulk_load(rows, db_path=DB_PATH, batch_size=DEFAULT_BATCH_SIZE,
+              progress_every=DEFAULT_PROGRESS_EVERY, replace=False):
+    # Усе завантаження (разом зі створенням таблиці та очищенням для --replace) —
+    # одна транзакція: помилковий рядок відкочує все, таблиця лишається як була
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    c = conn.cursor()
+    total = 0
+    next_progress = progress_every
+    started = time.perf_counter()
+    rows = iter(rows)
+    try:
+        for sql in LOAD_PRAGMAS:
+            c.execute(sql)
+        c.execute("BEGIN;")
+        try:
+            c.execute(SCHEMA_SQL)
+            if replace:
+                c.execute("DELETE FROM students;")
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                c.executemany(INSERT_SQL, batch)
+                total += len(batch)
+                if total >= next_progress:
+                    next_progress += progress_every
+                    elapsed = time.perf_counter() - started
+                    print(f"  {total} рядків, {total / elapsed:,.0f} рядків/с", file=sys.stderr)
+            c.execute("COMMIT;")
+        except BaseException:
+            c.execute("ROLLBACK;")
+            raise
+    finally:
+        conn.close()
+    load_time = time.perf_counter() - started
+    return {
+        "rows": total,
+        "load_seconds": load_time,
+        "rows_per_second": total / load_time if load_time > 0 else float("inf"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Масове завантаження студентів у students.db")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="згенерувати синтетичних студентів у CSV/JSONL")
+    gen.add_argument("--rows", type=int, default=1_000_000)
+    gen.add_argument("--seed", type=int, default=42)
+    gen.add_argument("--format", choices=("csv", "jsonl"))
+    gen.add_argument("-o", "--output", help="файл (за замовчуванням — stdout)")
+
+    load = sub.add_parser("load", help="завантажити CSV/JSONL або синтетичні дані")
+    load.add_argument("path", nargs="?", help="CSV або JSONL з полями " + ",".join(FIELDS))
+    load.add_argument("--format", choices=("csv", "jsonl"))
+    load.add_argument("--synthetic", type=int, metavar="N", help="замість файлу згенерувати N рядків")
+    load.add_argument("--seed", type=int, default=42)
+    load.add_argument("--db", help="файл бази SQLite (за замовчуванням LAB6_DB або lab6/students.db)")
+    load.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    load.add_argument("--progress-every", type=int, default=DEFAULT_PROGRESS_EVERY)
+    load.add_argument("--replace", action="store_true", help="очистити таблицю перед завантаженням")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        fmt = args.format or (detect_format(args.output) if args.output else "csv")
+        rows = generate_students(args.rows, args.seed)
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as f:
+                write_students(rows, f, fmt)
+            print(f"Згенеровано {args.rows} рядків у {args.output} (seed={args.seed})")
+        else:
+            write_students(rows, sys.stdout, fmt)
+        return 0
+
+    if args.synthetic is not None:
+        rows = generate_students(args.synthetic, args.seed)
+        source = f"синтетичні дані, seed={args.seed}"
+    elif args.path:
+        rows = read_students(args.path, args.format)
+        source = args.path
+    else:
+        parser.error("вкажіть файл або --synthetic N")
+
+    db_path = resolve_db_path(args.db)
+    print(f"Завантаження ({source}) у {os.path.abspath(db_path)}")
+    try:
+        stats = bulk_load(rows, db_path, args.batch_size, args.progress_every, args.replace)
+    except ValueError as e:
+        print(f"Помилка: {e}. Завантаження скасовано, таблиця не змінена.", file=sys.stderr)
+        return 1
+    print(f"Завантажено рядків: {stats['rows']}")
+    print(f"Час вставки: {stats['load_seconds']:.2f} с ({stats['rows_per_second']:,.0f} рядків/с)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import argparse
+import http.client
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+
+# Навантажувальний тест для lab6 (лише localhost, тільки стандартна бібліотека).
+# Для кожного ендпоінта виводить пропускну здатність та p50/p95/p99 затримки.
+#
+#   python labs.py asgi --workers 4 &
+#   python labs.py loadtest --concurrency 32 --duration 10
+
+ENDPOINTS = ("/safe_search", "/vulnerable_search")
+# Фрагменти прізвищ для запитів (відповідають генератору з bulk_load.py)
+SEARCH_TERMS = ["енко", "Петр", "Ков", "ук", "Змєул", "ськ", "Мороз", "ова", "ін", "а"]
+
+
+def percentile(sorted_values, p):
+    # Метод найближчого рангу
+    if not sorted_values:
+        return float("nan")
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def _worker(host, port, path, limit, deadline, seed, latencies, errors, lock):
+    rnd = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    local_lat = []
+    local_err = 0
+    while time.perf_counter() < deadline:
+        url = path + "?" + urlencode({"q": rnd.choice(SEARCH_TERMS), "limit": limit})
+        started = time.perf_counter()
+        try:
+            conn.request("GET", url)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                local_err += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            local_err += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        local_lat.append(time.perf_counter() - started)
+    conn.close()
+    with lock:
+        latencies.extend(local_lat)
+        errors[0] += local_err
+
+
+def run_endpoint(host, port, path, concurrency, duration, limit, seed=0):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration
+    threads = [
+        threading.Thread(target=_worker,
+                         args=(host, port, path, limit, deadline, seed + i, latencies, errors, lock))
+        for i in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "endpoint": path,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Навантажувальний тест ендпоінтів lab6 на localhost")
+    parser.add_argument("--host", default="127.0.0.1", choices=("127.0.0.1", "localhost", "::1"))
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="секунд на кожен ендпоінт")
+    parser.add_argument("--limit", type=int, default=20, help="розмір сторінки в запитах")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"Ціль: http://{args.host}:{args.port}, паралельність={args.concurrency}, "
+          f"тривалість={args.duration} с на ендпоінт")
+    print(f"{'endpoint':<20}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for path in ENDPOINTS:
+        r = run_endpoint(args.host, args.port, path, args.concurrency, args.duration, args.limit, args.seed)
+        print(f"{r['endpoint']:<20}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10.1f}"
+              f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,36 @@
-from flask import Flask, request, jsonify
 import sqlite3
+import json
 import os
 import threading
 import time
 import sys
 
+from . import metrics
+
 # Зберігаємо базу поруч із файлом скрипта
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "students.db")
 
+
+def resolve_db_path(path=None):
+    # Шлях до бази для серверів і завантажувача: --db, інакше LAB6_DB, інакше DB_PATH
+    return path or os.environ.get("LAB6_DB") or DB_PATH
+
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS students (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        group_name TEXT
+    );
+"""
+INSERT_SQL = "INSERT INTO students (first_name, last_name, email, group_name) VALUES (?, ?, ?, ?);"
+# Вторинних індексів немає навмисно: пошук — це LIKE '%...%' з id > ? ORDER BY id,
+# і SQLite виконує його діапазонним пошуком по rowid; індекс по last_name
+# (BINARY) не використовується навіть для префіксного LIKE, а лише сповільнює вставку
+
 def init_db(path=DB_PATH, force=False):
     print(f"Створення БД за шляхом: {path}")
 
@@ -18,15 +40,10 @@ def init_db(path=DB_PATH, force=False):
 
     conn = sqlite3.connect(path)
     c = conn.cursor()
-    c.execute("""
-        CREATE TABLE students (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            email TEXT NOT NULL,
-            group_name TEXT
-        );
-    """)
+    if force:
+        # force — створити таблицю заново, а не дописати початкові рядки ще раз
+        c.execute("DROP TABLE IF EXISTS students;")
+    c.execute(SCHEMA_SQL)
 
     students = [
         ("Валерія", "Змєул", "valeriia.zmieul@hneu.net", "CS-1"),
@@ -34,68 +51,280 @@ def init_db(path=DB_PATH, force=False):
         ("Олена", "Коваль", "olena.koval@example.com", "CS-2"),
         ("Марко", "Іванов", "marko.ivanov@example.com", "CS-2"),
     ]
-    c.executemany(
-        "INSERT INTO students (first_name, last_name, email, group_name) VALUES (?, ?, ?, ?);",
-        students
-    )
+    c.executemany(INSERT_SQL, students)
     conn.commit()
     conn.close()
     print("Базу створено та заповнено.")
 
-def vulnerable_search_db(search_term, db_path=DB_PATH):
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
+SELECT_COLUMNS = "SELECT id, first_name, last_name, email, group_name FROM students "
+ROW_FIELDS = ("id", "first_name", "last_name", "email", "group")
+
+# Режим захисту від SQL-ін'єкцій для /vulnerable_search: block | log | off
+SQLI_GUARD_MODE = os.environ.get("LAB6_SQLI_GUARD", "block")
+GUARDED_PATHS = ("/vulnerable_search",)
+# Ендпоінти, для яких збираються метрики (/metrics)
+INSTRUMENTED_PATHS = ("/safe_search", "/vulnerable_search")
+
+# Пагінація за ключем (keyset): WHERE id > after_id ORDER BY id LIMIT n
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+# Розмір пакета для fetchmany() — пам'ять не залежить від кількості рядків
+FETCH_BATCH_SIZE = 500
+
+
+def row_to_dict(r):
+    return dict(zip(ROW_FIELDS, r))
+
+
+def build_vulnerable_query(search_term, after_id=0, limit=None):
+    # search_term навмисно конкатенується (демонстрація вразливості),
+    # after_id/limit — лише цілі числа, тому їх підстановка безпечна
+    limit = -1 if limit is None else int(limit)
     query = (
-        "SELECT id, first_name, last_name, email, group_name FROM students "
-        "WHERE last_name LIKE '%" + search_term + "%';"
+        SELECT_COLUMNS +
+        "WHERE last_name LIKE '%" + search_term + "%'" +
+        f" AND id > {int(after_id)} ORDER BY id LIMIT {limit};"
     )
+    return query, ()
+
+
+def build_safe_query(search_term, after_id=0, limit=None):
+    query = SELECT_COLUMNS + "WHERE last_name LIKE ? AND id > ? ORDER BY id LIMIT ?;"
+    params = (f"%{search_term}%", int(after_id), -1 if limit is None else int(limit))
+    return query, params
+
+
+def iter_rows(query, params=(), db_path=DB_PATH, batch_size=FETCH_BATCH_SIZE):
+    # Генератор: курсор читається пакетами, з'єднання закривається наприкінці
+    with metrics.phase("connect"):
+        conn = sqlite3.connect(db_path)
     try:
-        c.execute(query)
-        rows = c.fetchall()
-    except Exception as e:
-        rows = []
+        c = conn.cursor()
+        with metrics.phase("query"):
+            c.execute(query, params)
+        while True:
+            with metrics.phase("fetch"):
+                batch = c.fetchmany(batch_size)
+            if not batch:
+                break
+            for r in batch:
+                yield r
+    finally:
         conn.close()
-        return {"query": query, "error": str(e), "rows": rows}
-    conn.close()
-    return {"query": query, "rows": rows}
 
 
-def safe_search_db(search_term, db_path=DB_PATH):
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    query = "SELECT id, first_name, last_name, email, group_name FROM students WHERE last_name LIKE ?;"
+def _fetch_page(query, params, db_path, limit):
+    # Читаємо не більше limit + 1 рядків: зайвий рядок лише сигналізує,
+    # що є наступна сторінка (навіть якщо ін'єкція прибрала LIMIT)
+    rows = []
+    next_after_id = None
+    for r in iter_rows(query, params, db_path):
+        if limit is not None and len(rows) >= limit:
+            next_after_id = rows[-1][0]
+            break
+        rows.append(r)
+    return rows, next_after_id
+
+
+def vulnerable_search_db(search_term, db_path=DB_PATH, after_id=0, limit=None):
+    query, params = build_vulnerable_query(search_term, after_id, limit + 1 if limit is not None else None)
     try:
-        pattern = f"%{search_term}%"
-        c.execute(query, (pattern,))
-        rows = c.fetchall()
+        rows, next_after_id = _fetch_page(query, params, db_path, limit)
     except Exception as e:
-        rows = []
-        conn.close()
-        return {"query": query, "error": str(e), "rows": rows}
-    conn.close()
-    return {"query": query, "rows": rows}
+        metrics.add_rows(0, db_error=True)
+        return {"query": query, "error": str(e), "rows": [], "next_after_id": None}
+    metrics.add_rows(len(rows))
+    return {"query": query, "rows": rows, "next_after_id": next_after_id}
+
+
+def safe_search_db(search_term, db_path=DB_PATH, after_id=0, limit=None):
+    query, params = build_safe_query(search_term, after_id, limit + 1 if limit is not None else None)
+    try:
+        rows, next_after_id = _fetch_page(query, params, db_path, limit)
+    except Exception as e:
+        metrics.add_rows(0, db_error=True)
+        return {"query": query, "error": str(e), "rows": [], "next_after_id": None}
+    metrics.add_rows(len(rows))
+    return {"query": query, "rows": rows, "next_after_id": next_after_id}
+
+
+def iter_ndjson(query, params=(), db_path=DB_PATH):
+    # Кожен рядок БД — окремий JSON-рядок; помилка — останнім рядком
+    count = 0
+    db_error = False
+    try:
+        for r in iter_rows(query, params, db_path):
+            count += 1
+            yield json.dumps(row_to_dict(r), ensure_ascii=False) + "\n"
+    except Exception as e:
+        db_error = True
+        yield json.dumps({"query": query, "error": str(e)}, ensure_ascii=False) + "\n"
+    finally:
+        metrics.add_rows(count, db_error=db_error)
+
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def first_values(pairs):
+    # Як у Flask (request.args.get): з повторюваних параметрів береться перший
+    args = {}
+    for name, value in pairs:
+        args.setdefault(name, value)
+    return args
+
+
+def _best_mimetype(accept):
+    # Тип з найбільшим q; за рівного q — конкретніший (a/b перед a/* перед */*), потім перший
+    best, best_key = None, (0.0, 0)
+    for part in accept.split(","):
+        media, _, params = part.partition(";")
+        media = media.strip().lower()
+        if not media:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        key = (q, 0 if media == "*/*" else 1 if media.endswith("/*") else 2)
+        if q > 0 and key > best_key:
+            best, best_key = media, key
+    return best
+
+
+def wants_ndjson(args, accept=None):
+    if args.get("format") == "ndjson":
+        return True
+    return _best_mimetype(accept or "") == NDJSON_MIMETYPE
+
+
+def parse_search_args(args, accept=None):
+    # Спільний для Flask і ASGI розбір запиту пошуку: (q, ndjson, after_id, limit).
+    # args — відображення з першими значеннями параметрів; ValueError — відповідь 400
+    ndjson = wants_ndjson(args, accept)
+    # у режимі NDJSON без limit віддаємо всі рядки потоком
+    after_id, limit = parse_page_args(args, None if ndjson else DEFAULT_PAGE_LIMIT)
+    return args.get("q", ""), ndjson, after_id, limit
+
+
+def parse_page_args(args, default_limit):
+    # Повертає (after_id, limit) або кидає ValueError з описом
+    try:
+        after_id = int(args.get("after_id", 0))
+        limit = args.get("limit")
+        limit = None if limit is None else int(limit)
+    except ValueError:
+        raise ValueError("after_id та limit мають бути цілими числами")
+    if after_id < 0:
+        raise ValueError("after_id має бути >= 0")
+    if limit is None:
+        return after_id, default_limit
+    if limit < 1 or limit > MAX_PAGE_LIMIT:
+        raise ValueError(f"limit має бути в межах 1..{MAX_PAGE_LIMIT}")
+    return after_id, limit
+
+
+def create_app(db_path=None):
+    # Flask імпортується лише тут: функції пошуку можна використовувати без нього
+    from flask import Flask, Response, g, request, jsonify, stream_with_context
+    from .sqli_guard import install_flask_guard
+
+    db_path = resolve_db_path(db_path)
+    app = Flask(__name__)
+
+    def search_response(search_db, build_query):
+        try:
+            q, ndjson, after_id, limit = parse_search_args(request.args, request.headers.get("Accept"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if ndjson:
+            query, params = build_query(q, after_id, limit)
+            return Response(stream_with_context(iter_ndjson(query, params, db_path)),
+                            mimetype=NDJSON_MIMETYPE)
+
+        result = search_db(q, db_path=db_path, after_id=after_id, limit=limit)
+        with metrics.phase("convert"):
+            rows = [row_to_dict(r) for r in result.get("rows", [])]
+        body = {"query": result.get("query"), "rows": rows,
+                "next_after_id": result.get("next_after_id")}
+        if "error" in result:
+            body["error"] = result["error"]
+        with metrics.phase("serialize"):
+            return jsonify(body)
+
+    @app.route("/vulnerable_search", methods=["GET"])
+    def vulnerable_search_endpoint():
+        return search_response(vulnerable_search_db, build_vulnerable_query)
+
+    @app.route("/safe_search", methods=["GET"])
+    def safe_search_endpoint():
+        return search_response(safe_search_db, build_safe_query)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics_endpoint():
+        return Response(metrics.render_prometheus(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+    @app.before_request
+    def _start_metrics():
+        if request.path in INSTRUMENTED_PATHS:
+            g.metrics = metrics.start_request()
+
+    @app.after_request
+    def _finish_metrics(response):
+        state = g.pop("metrics", None)
+        if state is None:
+            return response
+        endpoint, status = request.path, response.status_code
+        if response.is_streamed:
+            # NDJSON-генератор виконується вже після after_request: запит (фази, рядки,
+            # профілювальник) завершуємо, коли сервер закриває відповідь
+            response.call_on_close(lambda: metrics.finish_request(*state, endpoint, status))
+        else:
+            metrics.finish_request(*state, endpoint, status)
+        return response
+
+    @app.teardown_request
+    def _finish_metrics_on_error(exc):
+        # after_request не викликається для необроблених винятків
+        state = g.pop("metrics", None)
+        if state is not None:
+            metrics.finish_request(*state, request.path, 500)
+
+    if SQLI_GUARD_MODE != "off":
+        install_flask_guard(app, ("vulnerable_search_endpoint",), block=SQLI_GUARD_MODE == "block")
+
+    return app
+
+
+_app = None
 
 
-app = Flask(__name__)
+def __getattr__(name):
+    # lr6.app створюється під час першого звернення (і лише тоді імпортується Flask)
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-@app.route("/vulnerable_search", methods=["GET"])
-def vulnerable_search_endpoint():
-    q = request.args.get("q", "")
-    result = vulnerable_search_db(q)
-    rows = [{"id": r[0], "first_name": r[1], "last_name": r[2],
-             "email": r[3], "group": r[4]} for r in result.get("rows", [])]
-    return jsonify({"query": result.get("query"), "rows": rows})
 
+def main(argv=None):
+    import argparse
 
-@app.route("/safe_search", methods=["GET"])
-def safe_search_endpoint():
-    q = request.args.get("q", "")
-    result = safe_search_db(q)
-    rows = [{"id": r[0], "first_name": r[1], "last_name": r[2],
-             "email": r[3], "group": r[4]} for r in result.get("rows", [])]
-    return jsonify({"query": result.get("query"), "rows": rows})
+    parser = argparse.ArgumentParser(description="Flask-сервер lab6 (режим розробки)")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--db", help="файл бази SQLite (за замовчуванням LAB6_DB або lab6/students.db)")
+    args = parser.parse_args(argv)
+    db_path = resolve_db_path(args.db)
+    init_db(db_path, force=False)
+    create_app(db_path).run(port=args.port)
 
 
 if __name__ == "__main__":
-    init_db(force=False)
-    app.run(port=5001)
\ No newline at end of file
+    main()
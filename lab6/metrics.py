@@ -0,0 +1,348 @@
+import atexit
+import contextvars
+import glob
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from .sqli_guard import guard_stats
+
+# Інструментація запитів lab6: гістограми затримок по ендпоінтах,
+# розподіл часу між фазами (з'єднання, запит, вибірка, перетворення рядків,
+# серіалізація), кількість рядків і помилок. Експорт — текстовий формат Prometheus.
+#
+# Профілювальник повільних запитів вмикається змінними середовища:
+#   LAB6_PROFILE_SLOW_MS=200  LAB6_PROFILE_DIR=/tmp/lab6-prof  python labs.py serve
+#
+# Лічильники живуть у пам'яті процесу. Якщо задано LAB6_METRICS_DIR, кожен
+# процес-воркер раз на SNAPSHOT_INTERVAL_S зберігає знімок у <dir>/<pid>.json,
+# а /metrics будь-якого воркера віддає суму всіх знімків. ASGI-сервер із
+# кількома воркерами (labs.py asgi --workers N) задає цей каталог сам.
+
+log = logging.getLogger("lab6.metrics")
+
+PREFIX = "lab6"
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ("connect", "query", "fetch", "convert", "serialize")
+
+# Стан поточного запиту: {"phases": {...}, "rows": n, "db_error": bool, "samples": Counter|None}
+_current = contextvars.ContextVar("lab6_request_state", default=None)
+_lock = threading.Lock()
+
+METRICS_DIR = os.environ.get("LAB6_METRICS_DIR")
+SNAPSHOT_INTERVAL_S = 1.0
+_snapshot_thread = None
+
+
+class Histogram:
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.series = {}  # labels -> [counts по бакетах..., sum, count]
+
+    def observe(self, labels, value):
+        with _lock:
+            s = self.series.get(labels)
+            if s is None:
+                s = self.series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+
+REQUEST_DURATION = Histogram()
+PHASE_DURATION = Histogram()
+REQUESTS = Counter()  # (endpoint, status)
+ROWS = Counter()      # endpoint
+ERRORS = Counter()    # (endpoint, kind)
+
+
+def start_request(attach_thread=True):
+    # attach_thread=False — для ASGI, де потік циклу подій спільний для всіх запитів;
+    # тоді потоки пулу реєструються через PROFILER.attach(state["samples"])
+    state = {"phases": {}, "rows": 0, "db_error": False, "samples": None,
+             "attached": attach_thread, "started": time.perf_counter()}
+    token = _current.set(state)
+    if PROFILER is not None:
+        state["samples"] = PROFILER.attach() if attach_thread else Counter()
+    return state, token
+
+
+def finish_request(state, token, endpoint, status):
+    duration = time.perf_counter() - state["started"]
+    if state["samples"] is not None:
+        if state["attached"]:
+            PROFILER.detach()
+        PROFILER.report(state["samples"], endpoint, duration)
+    _current.reset(token)
+
+    REQUEST_DURATION.observe((endpoint,), duration)
+    for name, seconds in state["phases"].items():
+        PHASE_DURATION.observe((endpoint, name), seconds)
+    if METRICS_DIR and _snapshot_thread is None:
+        _start_snapshots()
+    with _lock:
+        REQUESTS[(endpoint, status)] += 1
+        ROWS[endpoint] += state["rows"]
+        if state["db_error"]:
+            ERRORS[(endpoint, "db")] += 1
+        if status >= 500:
+            ERRORS[(endpoint, "http_5xx")] += 1
+        elif status >= 400:
+            ERRORS[(endpoint, "http_4xx")] += 1
+    return duration
+
+
+def current_state():
+    return _current.get()
+
+
+def add_phase(name, seconds):
+    state = _current.get()
+    if state is not None:
+        state["phases"][name] = state["phases"].get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase(name, time.perf_counter() - started)
+
+
+def add_rows(n, db_error=False):
+    state = _current.get()
+    if state is not None:
+        state["rows"] += n
+        state["db_error"] = state["db_error"] or db_error
+
+
+# --- Знімки для агрегації між процесами-воркерами ---
+def _entries(series):
+    # {labels: value} -> [[labels, value], ...] (мітки — списки, щоб пройти через JSON)
+    return [[list(k) if isinstance(k, tuple) else [k], list(v) if isinstance(v, list) else v]
+            for k, v in series.items()]
+
+
+def local_snapshot():
+    with _lock:
+        snap = {
+            "request_duration": _entries(REQUEST_DURATION.series),
+            "phase_duration": _entries(PHASE_DURATION.series),
+            "requests": _entries(REQUESTS),
+            "rows": _entries(ROWS),
+            "errors": _entries(ERRORS),
+        }
+    sqli = guard_stats()
+    snap["sqli_checked"] = [[[], sqli["checked"]]]
+    snap["sqli_detected"] = _entries(sqli["by_reason"])
+    return snap
+
+
+def write_snapshot(metrics_dir=None):
+    # Атомарний запис: читач бачить або старий, або новий файл повністю
+    metrics_dir = metrics_dir or METRICS_DIR
+    path = os.path.join(metrics_dir, f"{os.getpid()}.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(local_snapshot(), f)
+    os.replace(tmp, path)
+
+
+def reset_snapshot_dir(metrics_dir):
+    # Викликається до запуску воркерів: знімки попереднього запуску видаляються.
+    # Знімки воркерів, що завершилися під час роботи, лишаються — лічильники не спадають
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, "*.json")):
+        os.remove(path)
+
+
+def _safe_write_snapshot():
+    try:
+        write_snapshot()
+    except OSError as e:
+        log.warning("cannot write metrics snapshot to %s: %s", METRICS_DIR, e)
+
+
+def _snapshot_loop():
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL_S)
+        _safe_write_snapshot()
+
+
+def _start_snapshots():
+    # Запускається з першим запитом, тож процес-супервізор знімків не пише
+    global _snapshot_thread
+    with _lock:
+        if _snapshot_thread is not None:
+            return
+        _snapshot_thread = threading.Thread(target=_snapshot_loop, name="lab6-metrics-snapshot", daemon=True)
+        _snapshot_thread.start()
+    atexit.register(_safe_write_snapshot)
+
+
+def _read_snapshots(metrics_dir):
+    # Власний знімок береться з пам'яті, решта — з файлів інших воркерів
+    own = f"{os.getpid()}.json"
+    snapshots = [local_snapshot()]
+    for path in glob.glob(os.path.join(metrics_dir, "*.json")):
+        if os.path.basename(path) == own:
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError) as e:
+            log.warning("skipping metrics snapshot %s: %s", path, e)
+    return snapshots
+
+
+def merge_snapshots(snapshots):
+    # Сума по всіх процесах: для гістограм — поелементно, для лічильників — значень
+    merged = {}
+    for snap in snapshots:
+        for name, entries in snap.items():
+            series = merged.setdefault(name, {})
+            for labels, value in entries:
+                labels = tuple(labels)
+                current = series.get(labels)
+                if current is None:
+                    series[labels] = value
+                elif isinstance(value, list):
+                    series[labels] = [a + b for a, b in zip(current, value)]
+                else:
+                    series[labels] = current + value
+    return merged
+
+
+# --- Експорт у текстовому форматі Prometheus ---
+def _fmt_labels(names, values):
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _render_histogram(lines, name, help_text, series, label_names, buckets=DURATION_BUCKETS):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, s in sorted(series.items()):
+        for b, count in zip(buckets, s):
+            lines.append(f"{name}_bucket{_fmt_labels(label_names + ('le',), labels + (b,))} {count}")
+        lines.append(f"{name}_bucket{_fmt_labels(label_names + ('le',), labels + ('+Inf',))} {s[-1]}")
+        lines.append(f"{name}_sum{_fmt_labels(label_names, labels)} {s[-2]}")
+        lines.append(f"{name}_count{_fmt_labels(label_names, labels)} {s[-1]}")
+
+
+def _render_counter(lines, name, help_text, series, label_names, kind="counter"):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in sorted(series.items()):
+        lines.append(f"{name}{_fmt_labels(label_names, labels)} {value}")
+
+
+def render_prometheus():
+    if METRICS_DIR:
+        write_snapshot()
+        snapshots = _read_snapshots(METRICS_DIR)
+    else:
+        snapshots = [local_snapshot()]
+    merged = merge_snapshots(snapshots)
+
+    def get(name):
+        return merged.get(name, {})
+
+    lines = []
+    _render_histogram(lines, f"{PREFIX}_request_duration_seconds",
+                      "Request latency by endpoint.", get("request_duration"), ("endpoint",))
+    _render_histogram(lines, f"{PREFIX}_phase_duration_seconds",
+                      "Time spent per request phase (connect, query, fetch, convert, serialize).",
+                      get("phase_duration"), ("endpoint", "phase"))
+    _render_counter(lines, f"{PREFIX}_requests_total",
+                    "Requests by endpoint and HTTP status.", get("requests"), ("endpoint", "status"))
+    _render_counter(lines, f"{PREFIX}_rows_returned_total",
+                    "Rows returned by endpoint.", get("rows"), ("endpoint",))
+    _render_counter(lines, f"{PREFIX}_errors_total",
+                    "Errors by endpoint and kind (db, http_4xx, http_5xx).", get("errors"), ("endpoint", "kind"))
+    _render_counter(lines, f"{PREFIX}_sqli_checked_total",
+                    "Requests inspected by the SQL-injection guard.", get("sqli_checked") or {(): 0}, ())
+    _render_counter(lines, f"{PREFIX}_sqli_detected_total",
+                    "Suspected SQL injections by reason.", get("sqli_detected"), ("reason",))
+    _render_counter(lines, f"{PREFIX}_metrics_processes",
+                    "Worker processes whose metrics are summed in this output.",
+                    {(): len(snapshots)}, (), kind="gauge")
+    return "\n".join(lines) + "\n"
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --- Вибірковий профілювальник повільних запитів ---
+class SlowRequestProfiler:
+    # Фоновий потік періодично знімає стеки потоків, що обробляють запити
+    # (sys._current_frames). Якщо запит триваліший за поріг, найчастіші
+    # стеки пишуться в лог і, за бажанням, у файл формату collapsed stacks.
+
+    def __init__(self, threshold_s, interval_s=0.005, top=5, out_dir=None):
+        self.threshold_s = threshold_s
+        self.interval_s = interval_s
+        self.top = top
+        self.out_dir = out_dir
+        self._active = {}  # id потоку -> Counter стеків
+        self._thread = threading.Thread(target=self._run, name="lab6-profiler", daemon=True)
+        self._thread.start()
+
+    def attach(self, samples=None):
+        # Реєструє поточний потік; samples можна передати з іншого потоку (пул ASGI)
+        samples = Counter() if samples is None else samples
+        self._active[threading.get_ident()] = samples
+        return samples
+
+    def detach(self):
+        self._active.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval_s)
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            for tid, samples in list(self._active.items()):
+                frame = frames.get(tid)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if stack:
+                    samples[";".join(reversed(stack))] += 1
+
+    def report(self, samples, endpoint, duration):
+        if duration < self.threshold_s or not samples:
+            return
+        hot = samples.most_common(self.top)
+        total = sum(samples.values())
+        log.warning("slow request: endpoint=%s duration=%.1fms samples=%d", endpoint, duration * 1000, total)
+        for stack, count in hot:
+            log.warning("  %5.1f%% %s", count / total * 100, " > ".join(stack.split(";")[-3:]))
+        if self.out_dir:
+            os.makedirs(self.out_dir, exist_ok=True)
+            name = f"slow-{time.strftime('%Y%m%d-%H%M%S')}-{endpoint.strip('/')}-{int(duration * 1000)}ms.txt"
+            with open(os.path.join(self.out_dir, name), "w", encoding="utf-8") as f:
+                for stack, count in samples.most_common():
+                    f.write(f"{stack} {count}\n")
+
+
+def _profiler_from_env():
+    slow_ms = os.environ.get("LAB6_PROFILE_SLOW_MS")
+    if not slow_ms:
+        return None
+    return SlowRequestProfiler(float(slow_ms) / 1000.0, out_dir=os.environ.get("LAB6_PROFILE_DIR"))
+
+
+PROFILER = _profiler_from_env()
@@ -0,0 +1,201 @@
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+# Захист від SQL-ін'єкцій для ендпоінтів lab6.
+# Кожен параметр запиту перевіряється одним попередньо скомпільованим
+# регулярним виразом; вердикти для повторюваних значень кешуються.
+#
+#   python labs.py sqli-guard     # рівень виявлення на корпусі + вартість перевірки
+
+log = logging.getLogger("lab6.sqli_guard")
+
+# Літера в будь-якому алфавіті (без цифр та "_")
+_L = r"[^\W\d_]"
+
+# Одна альтернатива на кожен тип атаки; ім'я групи — причина спрацювання
+_SCANNER = re.compile(
+    r"(?P<comment>--|/\*|\*/|\#)"
+    # лапка, що не стоїть між двома літерами (апостроф у "Дем'яненко" дозволений)
+    rf"|(?P<quote>(?<!{_L})['\"`]|['\"`](?!{_L}))"
+    r"|(?P<union>\bunion\b(?:\s+all)?\s+select\b)"
+    r"|(?P<stacked>;\s*(?:select|insert|update|delete|drop|create|alter|attach|detach|pragma|replace|vacuum)\b)"
+    # OR 1=1, or 'a'='a', AND x LIKE x, OR TRUE
+    r"|(?P<tautology>\b(?:or|and)\b\s*\(?\s*(?P<q1>['\"]?)(?P<lhs>\w+)(?P=q1)\s*(?:=|==|<>|!=|\blike\b|\bis\b)\s*(?P<q2>['\"]?)(?P=lhs)(?P=q2)"
+    r"|\bor\b\s+(?:true|not\s+false|\d+)\b\s*(?:$|--|;|\)))"
+    r"|(?P<function>\b(?:sleep|load_extension|randomblob|zeroblob|sqlite_version|char|hex)\s*\()",
+    re.IGNORECASE,
+)
+
+_QUOTES = "'\"`"
+# Ключові слова та оператори SQL; разом із апострофом у значенні — ознака ін'єкції
+_SQL_TOKEN = re.compile(
+    r"\b(?:or|and|not|is|isnull|notnull|in|like|glob|regexp|match|between|collate|escape|"
+    r"select|union|from|where|limit|offset|order|group|having|case|when|then|exists|null|cast)\b"
+    r"|[=<>|()!,;*/+%&~]",
+    re.IGNORECASE,
+)
+
+_stats_lock = threading.Lock()
+_stats = {"checked": 0, "detected": 0, "by_reason": Counter()}
+
+
+@lru_cache(maxsize=8192)
+def scan(value):
+    # Повертає причину (назву групи) або None, якщо значення безпечне
+    if value.isalnum():
+        # швидкий шлях: літери/цифри (зокрема кирилиця) не можуть бути ін'єкцією
+        return None
+    m = _SCANNER.search(value)
+    if m is not None:
+        for name in ("comment", "quote", "union", "stacked", "tautology", "function"):
+            if m.group(name) is not None:
+                return name
+        return "unknown"
+    # Лишилися лише лапки між літерами. Щоб вийти з рядка SQL і повернутися в нього,
+    # потрібні дві лапки; одна допустима тільки в імені без слів і операторів SQL
+    quotes = sum(value.count(ch) for ch in _QUOTES)
+    if quotes > 1 or (quotes == 1 and _SQL_TOKEN.search(value)):
+        return "quote"
+    return None
+
+
+def check_params(params, endpoint=""):
+    # params: пари (ім'я, значення); повертає (ім'я, причина) першої знахідки або None
+    found = None
+    for name, value in params:
+        reason = scan(value)
+        if reason is not None:
+            found = (name, reason)
+            break
+    with _stats_lock:
+        _stats["checked"] += 1
+        if found is not None:
+            _stats["detected"] += 1
+            _stats["by_reason"][found[1]] += 1
+    if found is not None:
+        log.warning("SQL injection suspected: endpoint=%s param=%s reason=%s value=%r",
+                    endpoint, name, reason, value)
+    return found
+
+
+def guard_stats():
+    with _stats_lock:
+        return {"checked": _stats["checked"], "detected": _stats["detected"],
+                "by_reason": dict(_stats["by_reason"])}
+
+
+def blocked_body(found):
+    name, reason = found
+    return {"error": "запит відхилено: підозра на SQL-ін'єкцію", "param": name, "reason": reason}
+
+
+def install_flask_guard(app, endpoints, block=True):
+    # before_request для Flask: перевіряє всі параметри запиту на вибраних ендпоінтах
+    from flask import request, jsonify
+
+    @app.before_request
+    def _sqli_guard():
+        if request.endpoint not in endpoints:
+            return None
+        found = check_params(request.args.items(multi=True), request.path)
+        if found is not None and block:
+            return jsonify(blocked_body(found)), 400
+        return None
+
+    return app
+
+
+# --- Корпус для перевірки рівня виявлення ---
+INJECTION_CORPUS = [
+    "' OR 1=1 --",
+    "' OR '1'='1",
+    "' or 'a'='a",
+    "x' OR 1=1 --",
+    "' OR 1=1;--",
+    "1 OR 1=1",
+    "' OR TRUE--",
+    "admin'--",
+    "admin' #",
+    "admin'/*",
+    "%' UNION SELECT 1,2,3,4,5 --",
+    "' UNION ALL SELECT name, sql, 1, 2, 3 FROM sqlite_master --",
+    "' union/**/select 1,2,3,4,5--",
+    "'; DROP TABLE students; --",
+    "x'; DELETE FROM students; --",
+    "'; ATTACH DATABASE '/tmp/x.db' AS x; --",
+    "'; PRAGMA table_info(students); --",
+    "' AND 1=1 --",
+    "' AND x LIKE x",
+    "Петр' OR 'x'='x",
+    "' OR randomblob(100000000) --",
+    "' AND sqlite_version() --",
+    "' || load_extension('x') --",
+    "\" OR \"\"=\"",
+    "') OR ('1'='1",
+    "1; SELECT * FROM students",
+    "`",
+    "' OR 2>1 --",
+    "%' AND hex(email) LIKE '%",
+    "Змєул'--",
+    "x'OR'x'LIKE'x",
+    "x'OR(SELECT(substr(email,1,1))FROM(students)WHERE(id=1))LIKE'v",
+    "x'AND'x'GLOB'x",
+    "xOR'x'LIKE'x",
+    "x'||'",
+    "Петр'OR'1'='1",
+    "zzz'ISNULL OR 1 OR email COLLATE'b",
+    "zzz'ISNULL OR (SELECT unicode(substr(sql,1,1)) FROM sqlite_master LIMIT 1)>66 OR email COLLATE'b",
+]
+BENIGN_CORPUS = [
+    "Змєул", "Петренко", "Коваль", "Іванов", "енко", "а", "", "Дем'яненко",
+    "Мар'янович", "П'ятниця", "Коваль-Шевченко", "O'Brien", "Smith", "ivan.petrenko@example.com",
+    "CS-1", "Or", "Orlov", "Andersen", "Union", "Ткачук Олена", "Сол 1", "Hex",
+    "Д’Артаньян", "Мороз Ірина", "100%", "a_b", "D'Angelo", "Д'Ор", "L'Isle",
+    "Дем'яненко Олена", "Мар'яна-Софія",
+]
+
+
+def evaluate_corpus():
+    missed = [v for v in INJECTION_CORPUS if scan(v) is None]
+    false_positives = [v for v in BENIGN_CORPUS if scan(v) is not None]
+    return {
+        "detection_rate": 1 - len(missed) / len(INJECTION_CORPUS),
+        "missed": missed,
+        "false_positive_rate": len(false_positives) / len(BENIGN_CORPUS),
+        "false_positives": false_positives,
+    }
+
+
+def benchmark(iterations=200_000):
+    # Середня вартість перевірки одного значення (мкс): з кешем та без нього
+    values = INJECTION_CORPUS + BENIGN_CORPUS
+    results = {}
+    for label, func in (("uncached", scan.__wrapped__), ("cached", scan)):
+        scan.cache_clear()
+        started = time.perf_counter()
+        for i in range(iterations):
+            func(values[i % len(values)])
+        results[label] = (time.perf_counter() - started) / iterations * 1e6
+    return results
+
+
+def main(argv=None):
+    report = evaluate_corpus()
+    print(f"Рівень виявлення: {report['detection_rate'] * 100:.1f}% ({len(INJECTION_CORPUS)} ін'єкцій)")
+    for v in report["missed"]:
+        print("  пропущено:", repr(v))
+    print(f"Хибні спрацювання: {report['false_positive_rate'] * 100:.1f}% ({len(BENIGN_CORPUS)} звичайних значень)")
+    for v in report["false_positives"]:
+        print("  хибно:", repr(v))
+    cost = benchmark()
+    print(f"Вартість перевірки: {cost['uncached']:.2f} мкс без кешу, {cost['cached']:.2f} мкс з кешем")
+    return 0 if not report["missed"] and not report["false_positives"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
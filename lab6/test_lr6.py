@@ -0,0 +1,137 @@
+import json
+import sqlite3
+
+import pytest
+
+from lab6 import lr6, metrics
+from lab6.bulk_load import bulk_load, generate_students
+
+pytest.importorskip("flask")
+
+ROWS = 2500
+ENDPOINTS = ("/safe_search", "/vulnerable_search")
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("lab6") / "students.db")
+    bulk_load(generate_students(ROWS, seed=7), path, progress_every=ROWS + 1)
+    return path
+
+
+@pytest.fixture(scope="module")
+def client(db_path):
+    return lr6.create_app(db_path).test_client()
+
+
+def expected_ids(db_path, q):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [r[0] for r in conn.execute(
+            "SELECT id FROM students WHERE last_name LIKE ? ORDER BY id", (f"%{q}%",))]
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+@pytest.mark.parametrize("q", ["", "енко"])
+def test_pages_cover_all_rows_once(client, db_path, endpoint, q):
+    ids = []
+    after_id = 0
+    while after_id is not None:
+        resp = client.get(endpoint, query_string={"q": q, "limit": 97, "after_id": after_id})
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert len(body["rows"]) <= 97
+        ids.extend(r["id"] for r in body["rows"])
+        after_id = body["next_after_id"]
+    assert ids == expected_ids(db_path, q)
+
+
+def test_limit_one(client):
+    body = client.get("/safe_search", query_string={"limit": 1}).get_json()
+    assert [r["id"] for r in body["rows"]] == [1]
+    assert body["next_after_id"] == 1
+
+
+def test_limit_max(client):
+    body = client.get("/safe_search", query_string={"limit": lr6.MAX_PAGE_LIMIT}).get_json()
+    assert len(body["rows"]) == lr6.MAX_PAGE_LIMIT
+    assert body["next_after_id"] == body["rows"][-1]["id"]
+
+
+def test_default_limit(client):
+    body = client.get("/safe_search").get_json()
+    assert len(body["rows"]) == lr6.DEFAULT_PAGE_LIMIT
+
+
+def test_last_page_has_no_next(client):
+    body = client.get("/safe_search", query_string={"after_id": ROWS - 3, "limit": 10}).get_json()
+    assert [r["id"] for r in body["rows"]] == [ROWS - 2, ROWS - 1, ROWS]
+    assert body["next_after_id"] is None
+
+
+@pytest.mark.parametrize("args", [
+    {"after_id": "abc"},
+    {"after_id": -1},
+    {"limit": 0},
+    {"limit": lr6.MAX_PAGE_LIMIT + 1},
+    {"limit": "1.5"},
+])
+def test_bad_page_args(client, args):
+    resp = client.get("/safe_search", query_string=args)
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+
+def ndjson_lines(resp):
+    assert resp.status_code == 200
+    assert resp.mimetype == lr6.NDJSON_MIMETYPE
+    return [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_ndjson_streams_all_rows(client, db_path, endpoint):
+    rows = ndjson_lines(client.get(endpoint, query_string={"q": "енко", "format": "ndjson"}))
+    assert all(isinstance(r, dict) and set(r) == set(lr6.ROW_FIELDS) for r in rows)
+    assert [r["id"] for r in rows] == expected_ids(db_path, "енко")
+
+
+def test_ndjson_by_accept_header_with_page(client):
+    resp = client.get("/safe_search", query_string={"after_id": 10, "limit": 5},
+                      headers={"Accept": "application/json;q=0.5, application/x-ndjson"})
+    assert [r["id"] for r in ndjson_lines(resp)] == [11, 12, 13, 14, 15]
+
+
+def test_ndjson_error_is_last_line(db_path, monkeypatch):
+    # guard вимкнено, щоб незакрита лапка дійшла до SQLite
+    monkeypatch.setattr(lr6, "SQLI_GUARD_MODE", "off")
+    client = lr6.create_app(db_path).test_client()
+    rows = ndjson_lines(client.get("/vulnerable_search", query_string={"q": "x'", "format": "ndjson"}))
+    assert len(rows) == 1
+    assert "error" in rows[0]
+
+
+def series_count(hist, labels):
+    s = hist.series.get(labels)
+    return s[-1] if s else 0
+
+
+def test_ndjson_metrics_cover_stream(db_path, monkeypatch):
+    # фази й рядки потокової відповіді записуються до того ж запиту, а помилка БД — у errors
+    monkeypatch.setattr(lr6, "SQLI_GUARD_MODE", "off")
+    client = lr6.create_app(db_path).test_client()
+    endpoint = "/vulnerable_search"
+    before = (series_count(metrics.REQUEST_DURATION, (endpoint,)),
+              series_count(metrics.PHASE_DURATION, (endpoint, "fetch")),
+              metrics.ROWS[endpoint], metrics.ERRORS[(endpoint, "db")])
+
+    resp = client.get(endpoint, query_string={"format": "ndjson"}, buffered=True)
+    assert len(ndjson_lines(resp)) == ROWS
+    resp = client.get(endpoint, query_string={"q": "x'", "format": "ndjson"}, buffered=True)
+    assert "error" in ndjson_lines(resp)[0]
+
+    assert series_count(metrics.REQUEST_DURATION, (endpoint,)) == before[0] + 2
+    assert series_count(metrics.PHASE_DURATION, (endpoint, "fetch")) == before[1] + 1
+    assert metrics.ROWS[endpoint] == before[2] + ROWS
+    assert metrics.ERRORS[(endpoint, "db")] == before[3] + 1
@@ -0,0 +1,119 @@
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Єдина точка входу для всіх лабораторних:
+#   python labs.py password
+#   python labs.py serve --port 5001
+#   python labs.py importtime --check
+#
+# Модуль лабораторної імпортується лише для вибраної команди.
+# Лабораторні — пакети з відносними імпортами, тому окремий модуль запускається
+# з кореня репозиторію як python -m lab6.lr6 (а не python lab6/lr6.py).
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# команда -> (модуль, опис, чи приймає власні аргументи)
+COMMANDS = {
+    "password": ("lab1.Lr1", "аналіз стійкості паролів (лаб. 1)", False),
+    "cipher": ("lab2.Lr2", "шифри Цезаря та Віженера (лаб. 2)", False),
+    "stego": ("lab3.lr3", "LSB-стеганографія в зображенні (лаб. 3)", False),
+    "signature": ("lab4.lr4", "спрощений цифровий підпис (лаб. 4)", False),
+    "xor": ("lab5.lr5", "XOR-шифрування повідомлення (лаб. 5)", False),
+    "serve": ("lab6.lr6", "Flask-сервер пошуку студентів (лаб. 6)", True),
+    "asgi": ("lab6.asgi_app", "ASGI-сервер лаб. 6 (uvicorn, кілька воркерів)", True),
+    "bulk-load": ("lab6.bulk_load", "масове завантаження / генерація студентів", True),
+    "loadtest": ("lab6.loadtest", "навантажувальний тест ендпоінтів лаб. 6", True),
+    "sqli-guard": ("lab6.sqli_guard", "перевірка захисту від SQL-ін'єкцій", True),
+}
+
+# Модулі, що мають імпортуватися швидко й без важких залежностей, та бюджет часу (мс).
+# asgi_app потребує asyncio, тому його бюджет більший.
+IMPORT_BUDGETS_MS = {
+    "lab1.Lr1": 50, "lab2.Lr2": 50, "lab3.lr3": 50, "lab4.lr4": 50, "lab5.lr5": 50,
+    "lab6.lr6": 80, "lab6.sqli_guard": 50, "lab6.metrics": 60, "lab6.bulk_load": 80,
+    "lab6.asgi_app": 200,
+}
+HEAVY_MODULES = ("pandas", "numpy", "PIL", "flask", "werkzeug", "uvicorn")
+
+_PROBE = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {module}\n"
+    "t = time.perf_counter() - t\n"
+    "print(t)\n"
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))\n"
+)
+
+
+def measure_import(module, runs=5):
+    # Холодний імпорт у новому інтерпретаторі; береться найкращий результат
+    best = None
+    heavy = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.split("\n")
+        seconds = float(out[0])
+        heavy = [m for m in out[1].split(",") if m]
+        best = seconds if best is None else min(best, seconds)
+    return {"module": module, "ms": best * 1000, "heavy": heavy}
+
+
+def importtime(argv=None):
+    parser = argparse.ArgumentParser(prog="labs.py importtime",
+                                     description="Час холодного імпорту модулів лабораторних")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="множник бюджетів IMPORT_BUDGETS_MS (для повільних машин)")
+    parser.add_argument("--check", action="store_true",
+                        help="код виходу 1, якщо перевищено бюджет або імпортовано важкі модулі")
+    parser.add_argument("--output", help="дописати результати JSON-рядком у файл (для відстеження)")
+    args = parser.parse_args(argv)
+
+    results = [measure_import(m, args.runs) for m in IMPORT_BUDGETS_MS]
+    failed = False
+    print(f"{'module':<18}{'import ms':>10}{'budget':>8}  heavy modules")
+    for r in results:
+        budget = IMPORT_BUDGETS_MS[r["module"]] * args.budget_scale
+        bad = r["heavy"] or r["ms"] > budget
+        failed = failed or bad
+        print(f"{r['module']:<18}{r['ms']:>10.2f}{budget:>8.0f}  "
+              f"{','.join(r['heavy']) or '-'}{'  <-- !' if bad else ''}")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                "python": sys.version.split()[0], "results": results}) + "\n")
+    return 1 if args.check and failed else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(prog="labs.py", description="Лабораторні з кібербезпеки")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text, _) in COMMANDS.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+    sub.add_parser("importtime", help="виміряти час холодного імпорту модулів", add_help=False)
+
+    # Аргументи після назви команди передаються самій команді
+    args = parser.parse_args(argv[:1])
+    rest = argv[1:]
+
+    if args.command == "importtime":
+        return importtime(rest)
+    module_name, _, takes_args = COMMANDS[args.command]
+    if rest and not takes_args:
+        parser.error(f"команда {args.command} не приймає аргументів")
+    module = importlib.import_module(module_name)
+    result = module.main(rest) if takes_args else module.main()
+    return result or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+import pytest
+
+import labs
+
+# Запуск: python -m pytest -q
+
+
+@pytest.mark.parametrize("module", sorted(labs.IMPORT_BUDGETS_MS))
+def test_import_pulls_no_heavy_modules(module):
+    # Холодний імпорт у новому інтерпретаторі: pandas/PIL/flask/uvicorn — лише в main()
+    assert labs.measure_import(module, runs=1)["heavy"] == []
+
+
+@pytest.mark.parametrize("module", ["lab6.lr6", "lab6.asgi_app", "lab6.bulk_load"])
+def test_module_runs_with_dash_m(module):
+    result = subprocess.run([sys.executable, "-m", module, "--help"], cwd=labs.ROOT,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize("command", ["serve", "asgi", "bulk-load", "loadtest"])
+def test_cli_command_help(command):
+    result = subprocess.run([sys.executable, "labs.py", command, "--help"], cwd=labs.ROOT,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr